@@ -71,6 +71,7 @@ AGE Toolbox - Desktop Application Launcher
 
 import webview
 import threading
+import multiprocessing
 import time
 import sys
 import os
@@ -129,6 +130,8 @@ def main():
     print("👋 AGE Toolbox closed. Thanks for using it!")
 
 if __name__ == '__main__':
+    # Stunt workbooks are parsed in worker processes of the frozen executable
+    multiprocessing.freeze_support()
     main()
 '''
     
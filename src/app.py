@@ -4,199 +4,682 @@ Flask App for AGE Toolbox - Serves React Frontend + API
 """
 
 import os
+import sys
 import random
 import json
+import re
+import math
+import atexit
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from flask import Flask, send_from_directory, jsonify, request
 from flask_cors import CORS
 import openpyxl
 
-def load_stunts_data():
-    """Load stunts data from Excel file"""
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+DEFAULT_WORKBOOK = 'stunts.xlsx'
+
+# Parsed rows per workbook, keyed by path: (mtime_ns, size, rows)
+_workbook_cache = {}
+_store_lock = threading.Lock()
+# Workbook path -> lock held from loading a workbook until it is saved
+_workbook_locks = {}
+
+class StaleStuntError(Exception):
+    """Raised when a stunt row no longer holds the stunt the client saw"""
+
+def find_workbooks():
+    """Return every stunt workbook in the data directory, sorted by name"""
+    if not os.path.isdir(DATA_DIR):
+        return []
+    
+    workbooks = []
+    for filename in sorted(os.listdir(DATA_DIR)):
+        # Skip Office lock files left behind by open workbooks
+        if not filename.endswith('.xlsx') or filename.startswith('~$'):
+            continue
+        workbooks.append(os.path.join(DATA_DIR, filename))
+    return workbooks
+
+def workbook_path(source=None):
+    """Return the path of the workbook for a source name"""
+    if not source:
+        return os.path.join(DATA_DIR, DEFAULT_WORKBOOK)
+    return os.path.join(DATA_DIR, f"{os.path.basename(source)}.xlsx")
+
+def parse_workbook(path):
+    """Parse one workbook into (sheet, row, stunt) tuples without IDs"""
+    source = os.path.splitext(os.path.basename(path))[0]
+    wb = openpyxl.load_workbook(path, read_only=True)
+    rows = []
+    
     try:
-        excel_file = os.path.join(os.path.dirname(__file__), 'data', 'stunts.xlsx')
-        if not os.path.exists(excel_file):
-            print(f"Warning: Excel file not found: {excel_file}")
-            return []
-        
-        wb = openpyxl.load_workbook(excel_file)
-        stunts = []
-        stunt_id = 1
-        
         # Process each worksheet (category)
         for sheet_name in wb.sheetnames:
             ws = wb[sheet_name]
-            category = sheet_name
             
             # Skip header row, process data rows
-            for row in ws.iter_rows(min_row=2, values_only=True):
-                if not row[0] or not row[1] or not row[2]:  # Skip empty rows
+            for row_number, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+                if len(row) < 3 or not row[0] or not row[1] or not row[2]:  # Skip empty rows
                     continue
                 
-                sp_cost = row[0]
-                name = row[1]
-                description = row[2]
-                setting = row[3] if len(row) > 3 and row[3] else None
-                
                 stunt = {
-                    'id': stunt_id,
-                    'name': name,
-                    'cost': sp_cost,
-                    'category': category,
-                    'setting': setting,
-                    'description': description
+                    'name': row[1],
+                    'cost': row[0],
+                    'category': sheet_name,
+                    'setting': row[3] if len(row) > 3 and row[3] else None,
+                    'description': row[2],
+                    'source': source
                 }
-                stunts.append(stunt)
-                stunt_id += 1
-        
+                rows.append((sheet_name, row_number, stunt))
+    finally:
         wb.close()
-        return stunts
-        
-    except Exception as e:
-        print(f"Warning: Could not load stunts data from Excel: {e}")
-        return []
+    
+    return rows
+
+def workbook_lock(path):
+    """Return the lock that serializes writes to one workbook"""
+    with _store_lock:
+        return _workbook_locks.setdefault(path, threading.Lock())
+
+def invalidate_workbook(path):
+    """Drop a workbook from the cache so it is re-parsed on next load"""
+    with _store_lock:
+        _workbook_cache.pop(path, None)
+
+# Below this many bytes of changed workbooks, parsing inline is faster than
+# handing the work to worker processes
+PARSE_POOL_MIN_BYTES = 1024 * 1024
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
 
-def add_stunt_to_excel(category, name, cost, description, setting=None):
-    """Add a new stunt to the Excel file"""
-    excel_file = os.path.join(os.path.dirname(__file__), 'data', 'stunts.xlsx')
+def get_parse_pool():
+    """Return the worker pool for parsing workbooks, starting it on first use"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return _parse_pool
+
+@atexit.register
+def shutdown_parse_pool():
+    """Stop the workbook parsing workers"""
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown()
+
+def parse_workbooks(paths):
+    """Parse workbooks, in the worker pool when there is enough work for it
     
+    Returns {path: rows} for the workbooks that parsed successfully.
+    """
     try:
-        # Load existing workbook or create new one
-        if os.path.exists(excel_file):
-            wb = openpyxl.load_workbook(excel_file)
-        else:
-            wb = openpyxl.Workbook()
-            wb.remove(wb.active)
-        
-        # Get or create worksheet for the category
-        if category in wb.sheetnames:
-            ws = wb[category]
-        else:
-            ws = wb.create_sheet(title=category)
-            # Add headers if new sheet
-            headers = ['SP Cost', 'Name', 'Description', 'Setting']
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                cell.font = openpyxl.styles.Font(bold=True, color='FFFFFF')
-                cell.fill = openpyxl.styles.PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-                cell.alignment = openpyxl.styles.Alignment(horizontal='center', vertical='center')
-        
-        # Find next empty row
-        next_row = ws.max_row + 1
-        
-        # Add the stunt data
-        ws.cell(row=next_row, column=1, value=cost)
-        ws.cell(row=next_row, column=2, value=name)
-        ws.cell(row=next_row, column=3, value=description)
-        ws.cell(row=next_row, column=4, value=setting)  # Store blank for Universal stunts
-        
-        # Style the row
-        for col in range(1, 5):
-            cell = ws.cell(row=next_row, column=col)
-            cell.alignment = openpyxl.styles.Alignment(vertical='top', wrap_text=True)
-            if col == 3:  # Description column
-                cell.alignment = openpyxl.styles.Alignment(vertical='top', wrap_text=True, horizontal='left')
+        size = sum(os.path.getsize(path) for path in paths)
+    except OSError:
+        size = 0
+    
+    # openpyxl parsing is pure Python, so only processes parse in parallel
+    if len(paths) > 1 and (os.cpu_count() or 1) > 1 and size >= PARSE_POOL_MIN_BYTES:
+        pool = get_parse_pool()
+        futures = {path: pool.submit(parse_workbook, path) for path in paths}
+    else:
+        futures = None
+    
+    parsed = {}
+    for path in paths:
+        try:
+            parsed[path] = futures[path].result() if futures else parse_workbook(path)
+        except Exception as e:
+            print(f"Warning: Could not load stunts data from {path}: {e}")
+    return parsed
+
+def load_stunts_data():
+    """Load and merge stunts from every workbook in the data directory"""
+    workbooks = find_workbooks()
+    if not workbooks:
+        print(f"Warning: No stunt workbooks found in: {DATA_DIR}")
+    
+    # Only workbooks that changed on disk since the last load are re-parsed
+    stale = {}
+    with _store_lock:
+        for path in workbooks:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            cached = _workbook_cache.get(path)
+            if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+                stale[path] = (stat.st_mtime_ns, stat.st_size)
+    
+    # Parse without holding the lock so reads and writes are not blocked
+    parsed = parse_workbooks(list(stale)) if stale else {}
+    
+    with _store_lock:
+        for path in list(_workbook_cache):
+            if path not in workbooks:
+                del _workbook_cache[path]
         
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
+        # A workbook that failed to parse is dropped rather than served stale
+        for path in stale:
+            if path in parsed:
+                _workbook_cache[path] = stale[path] + (parsed[path],)
+            else:
+                _workbook_cache.pop(path, None)
         
-        # Set specific widths
-        ws.column_dimensions['A'].width = 8   # SP Cost
-        ws.column_dimensions['B'].width = 20  # Name
-        ws.column_dimensions['C'].width = 50  # Description
-        ws.column_dimensions['D'].width = 12  # Setting
+        # Merge into one store, in workbook then sheet order
+        stunts = []
+        for path in workbooks:
+            if path not in _workbook_cache:
+                continue
+            for sheet_name, row_number, stunt in _workbook_cache[path][2]:
+                stunt_id = make_stunt_id(stunt['source'], sheet_name, row_number)
+                stunts.append({'id': stunt_id, **stunt})
         
-        # Save the workbook
-        wb.save(excel_file)
-        wb.close()
-        return True
+        return stunts
+
+def make_stunt_id(source, sheet_name, row_number):
+    """Return the ID of a stunt row, independent of any other workbook"""
+    # Excel forbids ':' in sheet names, so the ID splits back unambiguously
+    return f"{source}:{sheet_name}:{row_number}"
+
+def locate_stunt(stunt_id):
+    """Return (workbook path, sheet name, row number) for a stunt ID"""
+    try:
+        source, sheet_name, row = stunt_id.rsplit(':', 2)
+        row = int(row)
+    except ValueError:
+        return None
+    
+    excel_file = workbook_path(source)
+    if not source or row < 2 or not os.path.exists(excel_file):
+        return None
+    return excel_file, sheet_name, row
+
+def find_stunt_row(wb, stunt_id, sheet_name, row, expected=None):
+    """Return the worksheet holding a stunt row, or None if the row holds no stunt
+    
+    Raises StaleStuntError if the row holds a different stunt than expected.
+    """
+    if sheet_name not in wb.sheetnames:
+        return None
+    
+    ws = wb[sheet_name]
+    cost, name, description = (ws.cell(row=row, column=col).value for col in range(1, 4))
+    if not cost or not name or not description:
+        return None
+    
+    # Guard against the workbook changing on disk after the client loaded it
+    for field, value in (('cost', cost), ('name', name)):
+        if expected and field in expected and str(expected[field]) != str(value):
+            raise StaleStuntError(f"Stunt {stunt_id} has changed, reload and try again")
+    return ws
+
+def add_stunt_to_excel(category, name, cost, description, setting=None, source=None):
+    """Add a new stunt to the Excel file for the given source"""
+    excel_file = workbook_path(source)
+    
+    try:
+        with workbook_lock(excel_file):
+            # Load existing workbook or create new one
+            if os.path.exists(excel_file):
+                wb = openpyxl.load_workbook(excel_file)
+            else:
+                wb = openpyxl.Workbook()
+                wb.remove(wb.active)
+            
+            # Get or create worksheet for the category
+            if category in wb.sheetnames:
+                ws = wb[category]
+            else:
+                ws = wb.create_sheet(title=category)
+                # Add headers if new sheet
+                headers = ['SP Cost', 'Name', 'Description', 'Setting']
+                for col, header in enumerate(headers, 1):
+                    cell = ws.cell(row=1, column=col, value=header)
+                    cell.font = openpyxl.styles.Font(bold=True, color='FFFFFF')
+                    cell.fill = openpyxl.styles.PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+                    cell.alignment = openpyxl.styles.Alignment(horizontal='center', vertical='center')
+            
+            # Find next empty row
+            next_row = ws.max_row + 1
+            
+            # Add the stunt data
+            ws.cell(row=next_row, column=1, value=cost)
+            ws.cell(row=next_row, column=2, value=name)
+            ws.cell(row=next_row, column=3, value=description)
+            ws.cell(row=next_row, column=4, value=setting)  # Store blank for Universal stunts
+            
+            # Style the row
+            for col in range(1, 5):
+                cell = ws.cell(row=next_row, column=col)
+                cell.alignment = openpyxl.styles.Alignment(vertical='top', wrap_text=True)
+                if col == 3:  # Description column
+                    cell.alignment = openpyxl.styles.Alignment(vertical='top', wrap_text=True, horizontal='left')
+            
+            # Auto-adjust column widths
+            for column in ws.columns:
+                max_length = 0
+                column_letter = column[0].column_letter
+                for cell in column:
+                    try:
+                        if len(str(cell.value)) > max_length:
+                            max_length = len(str(cell.value))
+                    except:
+                        pass
+                adjusted_width = min(max_length + 2, 50)
+                ws.column_dimensions[column_letter].width = adjusted_width
+            
+            # Set specific widths
+            ws.column_dimensions['A'].width = 8   # SP Cost
+            ws.column_dimensions['B'].width = 20  # Name
+            ws.column_dimensions['C'].width = 50  # Description
+            ws.column_dimensions['D'].width = 12  # Setting
+            
+            # Save the workbook
+            wb.save(excel_file)
+            wb.close()
+            invalidate_workbook(excel_file)
+            return True
         
     except Exception as e:
         print(f"Error adding stunt: {e}")
         return False
 
-def update_stunt_in_excel(stunt_id, category, name, cost, description, setting=None):
-    """Update an existing stunt in the Excel file"""
-    excel_file = os.path.join(os.path.dirname(__file__), 'data', 'stunts.xlsx')
+def update_stunt_in_excel(stunt_id, category, name, cost, description, setting=None, expected=None):
+    """Update an existing stunt in the Excel file it was loaded from"""
+    location = locate_stunt(stunt_id)
+    if location is None:
+        return False
     
+    excel_file, sheet_name, row = location
     try:
-        if not os.path.exists(excel_file):
-            return False
-        
-        wb = openpyxl.load_workbook(excel_file)
-        current_id = 1
-        
-        # Find the stunt by ID
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            for row in range(2, ws.max_row + 1):
-                if current_id == stunt_id:
-                    # Update the stunt data
-                    ws.cell(row=row, column=1, value=cost)
-                    ws.cell(row=row, column=2, value=name)
-                    ws.cell(row=row, column=3, value=description)
-                    ws.cell(row=row, column=4, value=setting)  # Store blank for Universal stunts
-                    
-                    # Save and return
-                    wb.save(excel_file)
-                    wb.close()
-                    return True
+        with workbook_lock(excel_file):
+            wb = openpyxl.load_workbook(excel_file)
+            try:
+                ws = find_stunt_row(wb, stunt_id, sheet_name, row, expected)
+                if ws is None:
+                    return False
                 
-                # Only increment if row has data
-                if ws.cell(row=row, column=1).value:
-                    current_id += 1
-        
-        wb.close()
-        return False
+                # Update the stunt data
+                ws.cell(row=row, column=1, value=cost)
+                ws.cell(row=row, column=2, value=name)
+                ws.cell(row=row, column=3, value=description)
+                ws.cell(row=row, column=4, value=setting)  # Store blank for Universal stunts
+                
+                wb.save(excel_file)
+            finally:
+                wb.close()
+            
+            invalidate_workbook(excel_file)
+            return True
         
+    except StaleStuntError:
+        raise
     except Exception as e:
         print(f"Error updating stunt: {e}")
         return False
 
-def delete_stunt_from_excel(stunt_id):
-    """Delete a stunt from the Excel file"""
-    excel_file = os.path.join(os.path.dirname(__file__), 'data', 'stunts.xlsx')
+def delete_stunt_from_excel(stunt_id, expected=None):
+    """Delete a stunt from the Excel file it was loaded from"""
+    location = locate_stunt(stunt_id)
+    if location is None:
+        return False
     
+    excel_file, sheet_name, row = location
     try:
-        if not os.path.exists(excel_file):
-            return False
-        
-        wb = openpyxl.load_workbook(excel_file)
-        current_id = 1
-        
-        # Find the stunt by ID
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            for row in range(2, ws.max_row + 1):
-                if current_id == stunt_id:
-                    # Delete the row
-                    ws.delete_rows(row)
-                    
-                    # Save and return
-                    wb.save(excel_file)
-                    wb.close()
-                    return True
+        with workbook_lock(excel_file):
+            wb = openpyxl.load_workbook(excel_file)
+            try:
+                ws = find_stunt_row(wb, stunt_id, sheet_name, row, expected)
+                if ws is None:
+                    return False
                 
-                # Only increment if row has data
-                if ws.cell(row=row, column=1).value:
-                    current_id += 1
-        
-        wb.close()
-        return False
+                # Delete the row
+                ws.delete_rows(row)
+                
+                wb.save(excel_file)
+            finally:
+                wb.close()
+            
+            invalidate_workbook(excel_file)
+            return True
         
+    except StaleStuntError:
+        raise
     except Exception as e:
         print(f"Error deleting stunt: {e}")
         return False
 
+# Roll logs must outlive the app, so they are kept next to the executable
+# rather than in the one-file build's temporary extraction directory
+if getattr(sys, 'frozen', False):
+    APP_DIR = os.path.dirname(sys.executable)
+else:
+    APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROLL_LOG_DIR = os.path.join(APP_DIR, 'rolls')
+ROLL_LOG_CAPACITY = 500
+ROLL_LOG_BATCH_SIZE = 20
+ROLL_LOG_MAX_SESSIONS = 32
+# Batches appended after the snapshot before the log is compacted, which
+# bounds replay to about one buffer's worth of rolls
+ROLL_LOG_COMPACT_BATCHES = ROLL_LOG_CAPACITY // ROLL_LOG_BATCH_SIZE
+DEFAULT_SESSION = 'default'
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+def score_roll(blue_dice, red_die, bonus, target):
+    """Apply the AGE rules to a roll and return its result"""
+    # Calculate total and stunt points
+    total = sum(blue_dice) + red_die + bonus
+    
+    success = None
+    if target is not None:
+        success = total >= target
+    
+    stunt_points = 0
+    has_doubles = False
+    
+    # Check for doubles (any two dice, including the red die)
+    all_dice = blue_dice + [red_die]
+    if len(set(all_dice)) < len(all_dice):  # If there are duplicates
+        has_doubles = True
+        # Only get stunt points if the roll was successful
+        if success:
+            stunt_points = red_die  # Stunt points are the value of the red die
+
+    return {
+        'blue_dice': blue_dice,
+        'red_die': red_die,
+        'total': total,
+        'bonus': bonus,
+        'stunt_points': stunt_points,
+        'has_doubles': has_doubles,
+        'target': target,
+        'success': success,
+        'display': f"[{blue_dice[0]}, {blue_dice[1]}] [{red_die}] + {bonus} = {total}"
+    }
+
+def is_number(value):
+    """Return whether a JSON value is a finite number and not a boolean"""
+    return (isinstance(value, (int, float)) and not isinstance(value, bool)
+            and math.isfinite(value))
+
+def is_valid_modifiers(bonus, target):
+    """Return whether a roll's bonus and target can be scored"""
+    return is_number(bonus) and (target is None or is_number(target))
+
+def is_valid_roll(roll):
+    """Return whether a compact roll read from disk has the expected shape"""
+    if not isinstance(roll, list) or len(roll) != 5:
+        return False
+    
+    dice, bonus, target = roll[0:3], roll[3], roll[4]
+    return (all(isinstance(die, int) and not isinstance(die, bool) and 1 <= die <= 6 for die in dice)
+            and is_valid_modifiers(bonus, target))
+
+class RollLog:
+    """Bounded roll history for one session with running statistics"""
+    
+    def __init__(self, path, capacity=ROLL_LOG_CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.closed = False  # Set once evicted, after which rolls are refused
+        self._reset()
+        self._replay()
+    
+    def _reset(self):
+        """Empty the buffer and aggregates"""
+        # Ring buffer of compact rolls: [blue 1, blue 2, red, bonus, target]
+        self.rolls = [None] * self.capacity
+        self.head = 0  # Next slot to write
+        self.size = 0
+        self.pending = []  # Rolls not yet written to disk
+        self.batches = 0  # Batches on disk after the snapshot
+        
+        # Running aggregates over every roll ever recorded
+        self.count = 0
+        self.doubles = 0
+        self.totals = {}
+        self.stunt_points = [0] * 7  # Indexed by SP earned
+        self.targets = {}  # TN -> [rolls, successes]
+    
+    def _replay(self):
+        """Rebuild the buffer and aggregates from the log on disk
+        
+        The log starts with an optional snapshot of the aggregates and the
+        latest rolls, followed by the batches appended since.
+        """
+        if not os.path.exists(self.path):
+            return
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        batch = json.loads(line)
+                    except ValueError:
+                        continue  # Skip a batch truncated by an interrupted write
+                    if isinstance(batch, dict):
+                        self._restore(batch)
+                        continue
+                    if not isinstance(batch, list):
+                        continue
+                    for roll in batch:
+                        if is_valid_roll(roll):
+                            self._apply(roll)
+                    self.batches += 1
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Warning: Could not read roll log {self.path}: {e}")
+    
+    def _snapshot(self):
+        """Return the aggregates and buffered rolls, oldest first"""
+        start = self.head - self.size
+        return {
+            'count': self.count,
+            'doubles': self.doubles,
+            'totals': [[total, n] for total, n in self.totals.items()],
+            'stunt_points': self.stunt_points,
+            'targets': [[tn, rolls, successes] for tn, (rolls, successes) in self.targets.items()],
+            'rolls': [self.rolls[(start + i) % self.capacity] for i in range(self.size)]
+        }
+    
+    def _restore(self, snapshot):
+        """Replace the buffer and aggregates with a snapshot"""
+        self._reset()
+        try:
+            count = int(snapshot['count'])
+            doubles = int(snapshot['doubles'])
+            totals = {total: int(n) for total, n in snapshot['totals']}
+            stunt_points = [int(n) for n in snapshot['stunt_points']]
+            targets = {tn: [int(rolls), int(successes)] for tn, rolls, successes in snapshot['targets']}
+            rolls = [roll for roll in snapshot['rolls'] if is_valid_roll(roll)]
+            if len(stunt_points) != 7:
+                raise ValueError('bad stunt point counts')
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Warning: Ignoring bad snapshot in roll log {self.path}: {e}")
+            return
+        
+        self.count, self.doubles, self.totals = count, doubles, totals
+        self.stunt_points, self.targets = stunt_points, targets
+        for roll in rolls[-self.capacity:]:
+            self._push(roll)
+    
+    def _push(self, roll):
+        """Add a compact roll to the buffer, overwriting the oldest"""
+        self.rolls[self.head] = roll
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+    
+    def _apply(self, roll):
+        """Add a compact roll to the buffer and update the aggregates"""
+        self._push(roll)
+        
+        result = score_roll(roll[0:2], roll[2], roll[3], roll[4])
+        self.count += 1
+        self.totals[result['total']] = self.totals.get(result['total'], 0) + 1
+        self.stunt_points[result['stunt_points']] += 1
+        if result['has_doubles']:
+            self.doubles += 1
+        if result['target'] is not None:
+            tn = self.targets.setdefault(result['target'], [0, 0])
+            tn[0] += 1
+            if result['success']:
+                tn[1] += 1
+    
+    def _flush(self):
+        """Append pending rolls to disk as one batch (caller holds the lock)"""
+        if not self.pending:
+            return
+        
+        line = json.dumps(self.pending, separators=(',', ':')).encode('utf-8') + b'\n'
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'ab+') as f:
+                # Terminate a batch truncated by an interrupted write, so it
+                # does not swallow this one when the log is replayed
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        line = b'\n' + line
+                f.write(line)
+            self.pending = []
+            self.batches += 1
+        except OSError as e:
+            print(f"Warning: Could not write roll log {self.path}: {e}")
+            return
+        
+        if self.batches >= ROLL_LOG_COMPACT_BATCHES:
+            self._compact()
+    
+    def _compact(self):
+        """Rewrite the log as a single snapshot (caller holds the lock)"""
+        line = json.dumps(self._snapshot(), separators=(',', ':')) + '\n'
+        temp_path = self.path + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(line)
+            os.replace(temp_path, self.path)
+            # The snapshot holds every pending roll as well
+            self.pending = []
+            self.batches = 0
+        except OSError as e:
+            print(f"Warning: Could not compact roll log {self.path}: {e}")
+    
+    def record(self, result):
+        """Record a scored roll
+        
+        Returns False if the log was evicted, so the caller can reload it.
+        """
+        roll = [*result['blue_dice'], result['red_die'], result['bonus'], result['target']]
+        with self.lock:
+            if self.closed:
+                return False
+            self._apply(roll)
+            self.pending.append(roll)
+            if len(self.pending) >= ROLL_LOG_BATCH_SIZE:
+                self._flush()
+            return True
+    
+    def flush(self):
+        """Write any pending rolls to disk"""
+        with self.lock:
+            self._flush()
+    
+    def clear(self):
+        """Forget every roll, in memory and on disk"""
+        with self.lock:
+            self._reset()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Warning: Could not remove roll log {self.path}: {e}")
+    
+    def close(self):
+        """Write pending rolls and refuse further ones"""
+        with self.lock:
+            self.closed = True
+            if self.pending or self.batches:
+                self._compact()
+            self._flush()  # Only writes anything if compacting failed
+    
+    def recent(self, limit):
+        """Return up to limit of the latest rolls, newest first"""
+        with self.lock:
+            limit = max(0, min(limit, self.size))
+            rolls = [self.rolls[(self.head - i - 1) % self.capacity] for i in range(limit)]
+        return [score_roll(roll[0:2], roll[2], roll[3], roll[4]) for roll in rolls]
+    
+    def stats(self):
+        """Return the running aggregates"""
+        with self.lock:
+            return {
+                'rolls': self.count,
+                'stored': self.size,
+                'capacity': self.capacity,
+                # [total, count] pairs, as JSON objects would reorder string keys
+                'totals': [[total, n] for total, n in sorted(self.totals.items())],
+                'doubles': self.doubles,
+                'doubles_rate': self.doubles / self.count if self.count else None,
+                'stunt_points': list(self.stunt_points),
+                'targets': {
+                    str(tn): {
+                        'rolls': rolls,
+                        'successes': successes,
+                        'success_rate': successes / rolls
+                    }
+                    for tn, (rolls, successes) in self.targets.items()
+                }
+            }
+
+# Loaded roll logs in least recently used order
+_roll_logs = OrderedDict()
+_roll_logs_lock = threading.Lock()
+
+def roll_log_path(session_id):
+    """Return the path of the roll log file for a session"""
+    return os.path.join(ROLL_LOG_DIR, f"{session_id}.jsonl")
+
+def get_roll_log(session_id, create=True):
+    """Return the roll log for a session, loading it from disk on first use
+    
+    Returns None if create is False and the session has never been logged.
+    """
+    with _roll_logs_lock:
+        if session_id in _roll_logs:
+            _roll_logs.move_to_end(session_id)
+            return _roll_logs[session_id]
+        
+        path = roll_log_path(session_id)
+        if not create and not os.path.exists(path):
+            return None
+        
+        log = _roll_logs[session_id] = RollLog(path)
+        if len(_roll_logs) > ROLL_LOG_MAX_SESSIONS:
+            # Flush before releasing the lock, so a reload of the evicted
+            # session replays every roll it recorded
+            _, evicted = _roll_logs.popitem(last=False)
+            evicted.close()
+        return log
+
+def record_roll(session_id, result):
+    """Record a scored roll in the session's log"""
+    # A log evicted after it was fetched refuses the roll; fetch it again
+    while not get_roll_log(session_id).record(result):
+        pass
+
+@atexit.register
+def flush_roll_logs():
+    """Write pending rolls for every session to disk"""
+    with _roll_logs_lock:
+        logs = list(_roll_logs.values())
+    for log in logs:
+        log.flush()
+
 app = Flask(__name__, static_folder='frontend/dist', static_url_path='')
 CORS(app)  # Enable CORS for React frontend
 
@@ -223,40 +706,60 @@ def api_roll_dice():
     bonus = data.get('bonus', 0)
     target = data.get('target', None)
     
+    session_id = str(data.get('session') or DEFAULT_SESSION)
+    
+    if not SESSION_ID_PATTERN.match(session_id):
+        return jsonify({'error': 'Invalid session'}), 400
+    
+    if not is_valid_modifiers(bonus, target):
+        return jsonify({'error': 'Bonus and target must be numbers'}), 400
+    
     # Roll 2 blue dice and 1 red die (stunt die)
     blue_dice = [random.randint(1, 6) for _ in range(2)]
     red_die = random.randint(1, 6)
     
-    # Calculate total and stunt points
-    total = sum(blue_dice) + red_die + bonus
+    response = score_roll(blue_dice, red_die, bonus, target)
+    record_roll(session_id, response)
+    return jsonify(response)
+
+@app.route('/api/rolls', methods=['GET'])
+def api_get_rolls():
+    """API endpoint for the latest rolls of a session"""
+    session_id = request.args.get('session', DEFAULT_SESSION)
+    limit = request.args.get('limit', 10, type=int)
     
-    success = None
-    if target is not None:
-        success = total >= target
+    if not SESSION_ID_PATTERN.match(session_id):
+        return jsonify({'error': 'Invalid session'}), 400
     
-    stunt_points = 0
-    has_doubles = False
+    log = get_roll_log(session_id, create=False)
+    return jsonify(log.recent(limit) if log else [])
+
+@app.route('/api/rolls', methods=['DELETE'])
+def api_clear_rolls():
+    """API endpoint for clearing the roll log of a session"""
+    session_id = request.args.get('session', DEFAULT_SESSION)
     
-    # Check for doubles (any two dice, including the red die)
-    all_dice = blue_dice + [red_die]
-    if len(set(all_dice)) < len(all_dice):  # If there are duplicates
-        has_doubles = True
-        # Only get stunt points if the roll was successful
-        if success:
-            stunt_points = red_die  # Stunt points are the value of the red die
+    if not SESSION_ID_PATTERN.match(session_id):
+        return jsonify({'error': 'Invalid session'}), 400
+    
+    log = get_roll_log(session_id, create=False)
+    if log:
+        log.clear()
+    return jsonify({'message': 'Roll log cleared'}), 200
 
-    response = {
-        'blue_dice': blue_dice,
-        'red_die': red_die,
-        'total': total,
-        'bonus': bonus,
-        'stunt_points': stunt_points,
-        'has_doubles': has_doubles,
-        'target': target,
-        'success': success,
-        'display': f"[{blue_dice[0]}, {blue_dice[1]}] [{red_die}] + {bonus} = {total}"
-    }
-    return jsonify(response)
+@app.route('/api/rolls/stats', methods=['GET'])
+def api_get_roll_stats():
+    """API endpoint for running roll statistics of a session"""
+    session_id = request.args.get('session', DEFAULT_SESSION)
+    
+    if not SESSION_ID_PATTERN.match(session_id):
+        return jsonify({'error': 'Invalid session'}), 400
+    
+    # A session that was never logged reports empty statistics
+    log = get_roll_log(session_id, create=False) or RollLog(roll_log_path(session_id))
+    stats = log.stats()
+    stats['session'] = session_id
+    return jsonify(stats)
 
 @app.route('/api/test', methods=['GET'])
 def api_test():
@@ -287,7 +790,8 @@ def api_add_stunt():
             name=data['name'],
             cost=data['cost'],
             description=data['description'],
-            setting=data.get('setting')
+            setting=data.get('setting'),
+            source=data.get('source')
         )
         
         if success:
@@ -298,7 +802,7 @@ def api_add_stunt():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/stunts/<int:stunt_id>', methods=['PUT'])
+@app.route('/api/stunts/<stunt_id>', methods=['PUT'])
 def api_update_stunt(stunt_id):
     """API endpoint for updating an existing stunt"""
     try:
@@ -317,7 +821,8 @@ def api_update_stunt(stunt_id):
             name=data['name'],
             cost=data['cost'],
             description=data['description'],
-            setting=data.get('setting')
+            setting=data.get('setting'),
+            expected=data.get('expected')
         )
         
         if success:
@@ -325,20 +830,26 @@ def api_update_stunt(stunt_id):
         else:
             return jsonify({'error': 'Stunt not found or update failed'}), 404
             
+    except StaleStuntError as e:
+        return jsonify({'error': str(e)}), 409
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/stunts/<int:stunt_id>', methods=['DELETE'])
+@app.route('/api/stunts/<stunt_id>', methods=['DELETE'])
 def api_delete_stunt(stunt_id):
     """API endpoint for deleting a stunt"""
     try:
-        success = delete_stunt_from_excel(stunt_id)
+        # The client passes the name and cost it saw for the stunt
+        expected = {field: request.args[field] for field in ('name', 'cost') if field in request.args}
+        success = delete_stunt_from_excel(stunt_id, expected)
         
         if success:
             return jsonify({'message': 'Stunt deleted successfully'}), 200
         else:
             return jsonify({'error': 'Stunt not found or delete failed'}), 404
             
+    except StaleStuntError as e:
+        return jsonify({'error': str(e)}), 409
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1,4 +1,4 @@
-import React, { useState } from 'react'
+import React, { useState, useEffect } from 'react'
 import { Card, Row, Col, Form, Button, Alert, ListGroup, Badge, Spinner } from 'react-bootstrap'
 import { apiService } from '../services/api'
 
@@ -9,6 +9,20 @@ const DiceRoller = () => {
   const [loading, setLoading] = useState(false)
   const [history, setHistory] = useState([])
 
+  useEffect(() => {
+    loadHistory()
+  }, [])
+
+  const loadHistory = async () => {
+    try {
+      const rolls = await apiService.getRolls(10)
+      // Don't overwrite rolls made while the log was loading
+      setHistory(prev => prev.length > 0 ? prev : rolls)
+    } catch (error) {
+      console.error('Error loading roll history:', error)
+    }
+  }
+
   const handleRoll = async (e) => {
     e.preventDefault()
     setLoading(true)
@@ -26,8 +40,13 @@ const DiceRoller = () => {
     }
   }
 
-  const clearHistory = () => {
-    setHistory([])
+  const clearHistory = async () => {
+    try {
+      await apiService.clearRolls()
+      setHistory([])
+    } catch (error) {
+      console.error('Error clearing roll history:', error)
+    }
   }
 
   return (
@@ -60,7 +60,10 @@ const StuntModal = ({ show, onHide, stunt, onSuccess }) => {
 
       if (stunt) {
         // Update existing stunt
-        await apiService.updateStunt(stunt.id, stuntData)
+        await apiService.updateStunt(stunt.id, {
+          ...stuntData,
+          expected: { name: stunt.name, cost: stunt.cost }
+        })
       } else {
         // Add new stunt
         await apiService.addStunt(stuntData)
@@ -104,14 +104,14 @@ const Stunts = () => {
     setShowModal(true)
   }
 
-  const handleDeleteStunt = async (stuntId) => {
+  const handleDeleteStunt = async (stunt) => {
     if (window.confirm('Are you sure you want to delete this stunt?')) {
       try {
-        await apiService.deleteStunt(stuntId)
+        await apiService.deleteStunt(stunt)
         await loadStunts() // Reload data
       } catch (err) {
         console.error('Error deleting stunt:', err)
-        setError('Failed to delete stunt')
+        setError(err.response?.data?.error || 'Failed to delete stunt')
       }
     }
   }
@@ -419,7 +419,7 @@ const Stunts = () => {
                           </Button>
                           <Button 
                             variant="outline-danger" 
-                            onClick={() => handleDeleteStunt(stunt.id)}
+                            onClick={() => handleDeleteStunt(stunt)}
                             title="Delete stunt"
                           >
                             <i className="ra ra-skull"></i>
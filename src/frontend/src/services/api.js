@@ -18,6 +18,20 @@ const apiService = {
     return response.data
   },
 
+  // Get latest rolls
+  async getRolls(limit = 10) {
+    const response = await axios.get(`${API_BASE_URL}/rolls`, {
+      params: { limit }
+    })
+    return response.data
+  },
+
+  // Clear the roll log
+  async clearRolls() {
+    const response = await axios.delete(`${API_BASE_URL}/rolls`)
+    return response.data
+  },
+
         // Get stunts data
         async getStunts() {
             const response = await axios.get(`${API_BASE_URL}/stunts`)
@@ -32,13 +46,15 @@ const apiService = {
 
         // Update existing stunt
         async updateStunt(stuntId, stuntData) {
-            const response = await axios.put(`${API_BASE_URL}/stunts/${stuntId}`, stuntData)
+            const response = await axios.put(`${API_BASE_URL}/stunts/${encodeURIComponent(stuntId)}`, stuntData)
             return response.data
         },
 
-        // Delete stunt
-        async deleteStunt(stuntId) {
-            const response = await axios.delete(`${API_BASE_URL}/stunts/${stuntId}`)
+        // Delete stunt, passing the name and cost it was loaded with
+        async deleteStunt(stunt) {
+            const response = await axios.delete(`${API_BASE_URL}/stunts/${encodeURIComponent(stunt.id)}`, {
+                params: { name: stunt.name, cost: stunt.cost }
+            })
             return response.data
         }
 }